@@ -1,8 +1,7 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import pathlib
-import random
 import uuid
 
 # --- MASTER DATA ---
@@ -17,71 +16,68 @@ CUSTOMER_MASTER = [
     {"Customer": "Best Buy",  "Priority": 9, "Segment": "Gaming Retail"},
 ]
 
-def get_iso_week(date_obj):
-    iso_cal = date_obj.isocalendar()
-    return f"{iso_cal.year}-W{iso_cal.week:02d}"
+def get_iso_week(dates):
+    iso_cal = dates.dt.isocalendar()
+    return iso_cal['year'].astype(str) + "-W" + iso_cal['week'].astype(str).str.zfill(2)
 
 def generate_csvs():
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     base_date = datetime(2026, 1, 1)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = pathlib.Path('./data_inputs')
     output_dir.mkdir(exist_ok=True)
 
-    raw_supply = []
-    raw_demand = []
     days = 30 * 7
+    dates = pd.Series(pd.date_range(base_date, periods=days, freq='D'))
+    weeks = get_iso_week(dates).to_numpy()
+    dates = dates.to_numpy()
 
-    for i in range(days):
-        curr_date = base_date + timedelta(days=i)
-        curr_week = get_iso_week(curr_date)
-        
-        # Supply Generation
-        if np.random.random() > 0.1: 
-            raw_supply.append({
-                "week": curr_week,              # <--- 1st Column
-                "delivery_date": curr_date,
-                "product_type": "Subcomponent_1", 
-                "quantity": np.random.randint(10, 50)
-            })
-        if np.random.random() > 0.1:
-            raw_supply.append({
-                "week": curr_week,              # <--- 1st Column
-                "delivery_date": curr_date,
-                "product_type": "Subcomponent_2", 
-                "quantity": np.random.randint(10, 60)
-            })
-            
-        # Demand Generation
-        if np.random.random() > 0.1:
-            cust = random.choice(CUSTOMER_MASTER)
-            raw_demand.append({
-                "week": curr_week,              # <--- 1st Column
-                "delivery_date": curr_date, 
-                "order_id": f"ORD-{uuid.uuid4().hex[:6].upper()}",
-                "product_type": "Advanced_Chip", 
-                "quantity": np.random.randint(10, 90),
-                "Customer": cust["Customer"] 
-            })
+    # Draw every day's randomness in bulk (one call per stream instead of per day)
+    mask_s1 = rng.random(days) > 0.1
+    mask_s2 = rng.random(days) > 0.1
+    mask_dem = rng.random(days) > 0.1
+    qty_s1 = rng.integers(10, 50, days)
+    qty_s2 = rng.integers(10, 60, days)
+    qty_dem = rng.integers(10, 90, days)
+    cust_idx = rng.integers(0, len(CUSTOMER_MASTER), days)[mask_dem]
+    customer_names = np.array([c["Customer"] for c in CUSTOMER_MASTER])
 
-    # Create DataFrames
-    df_supply = pd.DataFrame(raw_supply)
-    df_demand = pd.DataFrame(raw_demand)
-    
-    # Enforce Column Order (Week First)
-    supply_cols = ["week", "delivery_date", "product_type", "quantity"]
-    demand_cols = ["week", "delivery_date", "order_id", "Customer", "product_type", "quantity"]
-    
-    df_supply = df_supply[supply_cols]
-    df_demand = df_demand[demand_cols]
+    # Supply Generation (Week First)
+    df_supply = pd.concat([
+        pd.DataFrame({
+            "week": weeks[mask_s1],
+            "delivery_date": dates[mask_s1],
+            "product_type": "Subcomponent_1",
+            "quantity": qty_s1[mask_s1]
+        }),
+        pd.DataFrame({
+            "week": weeks[mask_s2],
+            "delivery_date": dates[mask_s2],
+            "product_type": "Subcomponent_2",
+            "quantity": qty_s2[mask_s2]
+        }),
+    ], ignore_index=True)
+    df_supply = df_supply.sort_values(by=['delivery_date', 'product_type'], kind='stable').reset_index(drop=True)
+
+    # Demand Generation (Week First)
+    df_demand = pd.DataFrame({
+        "week": weeks[mask_dem],
+        "delivery_date": dates[mask_dem],
+        "order_id": [f"ORD-{uuid.uuid4().hex[:6].upper()}" for _ in range(len(cust_idx))],
+        "Customer": np.take(customer_names, cust_idx),
+        "product_type": "Advanced_Chip",
+        "quantity": qty_dem[mask_dem]
+    })
 
-    # Save Files
-    df_supply.to_csv(output_dir / f"supply_data_{timestamp}.csv", index=False)
-    df_demand.to_csv(output_dir / f"demand_data_{timestamp}.csv", index=False)
+    # Save Files (Parquet keeps dtypes, so the processor skips CSV parsing)
+    df_supply = df_supply.astype({'product_type': 'category'})
+    df_demand = df_demand.astype({'product_type': 'category', 'Customer': 'category'})
+    df_supply.to_parquet(output_dir / f"supply_data_{timestamp}.parquet", index=False)
+    df_demand.to_parquet(output_dir / f"demand_data_{timestamp}.parquet", index=False)
     pd.DataFrame(CUSTOMER_MASTER).to_csv(output_dir / "master_customer_tiers.csv", index=False)
     
     print(f"[SUCCESS] Data Generated.")
-    print(f" -> Week is now the 1st column in generated CSVs.")
+    print(f" -> Week is now the 1st column in generated Parquet files.")
 
 if __name__ == "__main__":
     generate_csvs()
\ No newline at end of file
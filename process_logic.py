@@ -2,71 +2,117 @@ import pandas as pd
 import numpy as np
 import glob
 import os
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from numba import njit
+
+# Order status labels, indexed by the codes returned from pour_fifo
+STATUS_LABELS = ["Full", "Partial", "Unfulfilled"]
 
 def get_latest_file(pattern, directory='./data_inputs'):
     files = glob.glob(os.path.join(directory, pattern))
     if not files: raise FileNotFoundError(f"No files found for {pattern}")
     return max(files, key=os.path.getctime)
 
+@njit(cache=True)
+def pour_fifo(cust_codes, qty, pools):
+    # Orders arrive grouped by customer, oldest first within each customer.
+    # Each customer's pool is poured into their orders until the bucket is empty.
+    n = qty.shape[0]
+    given = np.empty(n, dtype=np.int64)
+    status = np.empty(n, dtype=np.int8)
+    prev_cust = -1
+    chips_in_bucket = 0
+    for i in range(n):
+        if cust_codes[i] != prev_cust:
+            prev_cust = cust_codes[i]
+            chips_in_bucket = pools[prev_cust]
+        
+        if chips_in_bucket >= qty[i]:
+            given[i] = qty[i]
+            chips_in_bucket -= qty[i]
+            status[i] = 0  # Full
+        else:
+            given[i] = chips_in_bucket
+            chips_in_bucket = 0  # Bucket empty
+            status[i] = 2 if given[i] == 0 else 1  # Unfulfilled / Partial
+    return given, status
+
 def process_supply_chain_data():
     print("--- Starting Processor (FIFO Backlog Logic) ---")
     
     # 1. LOAD DATA
-    file_supply = get_latest_file("supply_data_*.csv")
-    file_demand = get_latest_file("demand_data_*.csv")
+    file_supply = get_latest_file("supply_data_*.parquet")
+    file_demand = get_latest_file("demand_data_*.parquet")
     file_master = "./data_inputs/master_customer_tiers.csv"
     
-    df_supply = pd.read_csv(file_supply)
-    df_demand = pd.read_csv(file_demand)
-    df_master = pd.read_csv(file_master)
+    # Low-cardinality labels are loaded as categoricals so groupby/merge work on integer codes
+    # (Parquet snapshots already store them dictionary-encoded, so the casts are no-ops).
+    # High-cardinality order_id stays Arrow-backed so sorts compare packed bytes, not PyObjects.
+    df_supply = pd.read_parquet(file_supply).astype({'product_type': 'category'})
+    df_demand = pd.read_parquet(file_demand).astype({
+        'product_type': 'category', 'Customer': 'category', 'order_id': 'string[pyarrow]'
+    })
+    df_master = pd.read_csv(file_master, dtype={'Customer': 'category'}).set_index('Customer')
     
-    # 2. MERGE MASTER DATA
-    df_demand = df_demand.merge(df_master, on='Customer', how='left')
-    df_demand['Priority'] = df_demand['Priority'].fillna(99)
-    df_demand['Segment'] = df_demand['Segment'].fillna("Unknown")
+    # 2. MERGE MASTER DATA (left join against the Customer index)
+    df_demand = df_demand.join(df_master, on='Customer')
+    df_demand['Customer'] = df_demand['Customer'].astype('category')
+    df_demand['Priority'] = df_demand['Priority'].fillna(99).astype('category')
+    df_demand['Segment'] = df_demand['Segment'].fillna("Unknown").astype('category')
 
     # 3. GLOBAL CONSTRAINT (Total Available Supply Curve)
-    supply_agg = df_supply.groupby(['week', 'product_type'])['quantity'].sum().unstack(fill_value=0)
+    supply_agg = df_supply.groupby(['week', 'product_type'], observed=True)['quantity'].sum().unstack(fill_value=0)
     for c in ['Subcomponent_1', 'Subcomponent_2']: 
         if c not in supply_agg: supply_agg[c] = 0
     
-    demand_global = df_demand.groupby(['week', 'product_type'])['quantity'].sum().unstack(fill_value=0)
+    demand_global = df_demand.groupby(['week', 'product_type'], observed=True)['quantity'].sum().unstack(fill_value=0)
     if 'Advanced_Chip' not in demand_global: demand_global['Advanced_Chip'] = 0
 
-    master = supply_agg.join(demand_global, how='outer').fillna(0).astype(int).sort_index()
+    # Align both curves on the sorted union of weeks, then stack them side by side
+    all_weeks = supply_agg.index.union(demand_global.index)
+    master = pd.concat([
+        supply_agg.reindex(all_weeks, fill_value=0),
+        demand_global.reindex(all_weeks, fill_value=0)
+    ], axis=1).astype('int32')
     
     # Calculate Cumulative Supply Limit
-    master['Next_Week_Demand'] = master['Advanced_Chip'].shift(-1).fillna(0)
+    master['Next_Week_Demand'] = master['Advanced_Chip'].shift(-1, fill_value=0)
     master['Demand_Prior'] = master['Advanced_Chip'] + master['Next_Week_Demand']
-    master['Total_Commit_Cum'] = master[['Subcomponent_1', 'Subcomponent_2', 'Demand_Prior']].cumsum().min(axis=1)
+    limit_cols = ['Subcomponent_1', 'Subcomponent_2', 'Demand_Prior']
+    limit_arr = np.ascontiguousarray(master[limit_cols].to_numpy(dtype=np.int32))
+    master['Total_Commit_Cum'] = np.minimum.reduce(limit_arr.cumsum(axis=0), axis=1)
 
     # ==========================================================================
     # 4. FIFO ALLOCATION LOGIC
     # ==========================================================================
     print("Calculating FIFO Allocation...")
     
-    final_rows = []
+    # One columnar frame per tier; labels stay categorical/Arrow-backed (no per-row objects)
+    tier_frames = []
     
     # We use the cumulative supply curve to determine total limits
-    remaining_supply_curve = master['Total_Commit_Cum'].copy()
+    # (one buffer, drawn down in place by each tier)
+    remaining_supply_curve = master['Total_Commit_Cum'].to_numpy(dtype=np.int64).copy()
     
-    # Sort Priorities to ensure Tier 1 eats first
-    priorities = sorted(df_demand['Priority'].unique())
+    # Cumulative demand curve of every tier at once (weeks x priorities)
+    tier_demand = df_demand.groupby(['week', 'Priority'], observed=True)['quantity'].sum().unstack(fill_value=0)
+    tier_demand = tier_demand.reindex(master.index, fill_value=0)
+    tier_cum = tier_demand.cumsum().to_numpy()
+    priority_to_col = {p: i for i, p in enumerate(tier_demand.columns)}
     
-    for p in priorities:
+    # Partition by Priority once; sort=True ensures Tier 1 eats first
+    for p, df_p in df_demand.groupby('Priority', sort=True, observed=True):
         # --- A. TIER LEVEL (How much does the Tier get?) ---
-        df_p = df_demand[df_demand['Priority'] == p]
-        
-        # Calculate Tier Demand Curve
-        tier_demand_raw = df_p.groupby('week')['quantity'].sum()
-        tier_demand_cum = tier_demand_raw.reindex(master.index, fill_value=0).cumsum()
+        # Tier Demand Curve (precomputed column)
+        tier_demand_cum = tier_cum[:, priority_to_col[p]]
         
         # Calculate Tier Allocation Curve (The Limit)
         tier_allocated_cum = np.minimum(tier_demand_cum, remaining_supply_curve)
         
         # Calculate Global Fill Rate for this Tier (Total Given / Total Asked)
-        total_tier_demand = tier_demand_cum.iloc[-1] if len(tier_demand_cum) > 0 else 0
-        total_tier_alloc = tier_allocated_cum.iloc[-1] if len(tier_allocated_cum) > 0 else 0
+        total_tier_demand = tier_demand_cum[-1] if len(tier_demand_cum) > 0 else 0
+        total_tier_alloc = tier_allocated_cum[-1] if len(tier_allocated_cum) > 0 else 0
         
         if total_tier_demand > 0:
             tier_global_rate = total_tier_alloc / total_tier_demand
@@ -74,62 +120,49 @@ def process_supply_chain_data():
             tier_global_rate = 1.0
 
         # --- B. CUSTOMER LEVEL (Pour into Oldest Orders First) ---
-        tier_customers = df_p['Customer'].unique()
+        # 1. CRITICAL STEP: SORT ORDERS BY WEEK (Oldest First) within each customer
+        # This ensures Week 1 Backlog is prioritized over Week 3 New Orders
+        df_p = df_p.sort_values(by=['Customer', 'week', 'order_id'])
+        
+        # 2. Calculate each Customer's Total "Bank Account" of Chips
+        # They get their fair share (Pro-Rata) of the Tier's allocation
+        # (indexed by Customer category code, so unobserved customers get 0)
+        cust_demand = df_p.groupby('Customer', observed=False)['quantity'].sum()
+        cust_pools = (cust_demand * tier_global_rate).astype(np.int64).to_numpy()
         
-        for cust in tier_customers:
-            # 1. CRITICAL STEP: SORT ORDERS BY WEEK (Oldest First)
-            # This ensures Week 1 Backlog is prioritized over Week 3 New Orders
-            cust_orders = df_p[df_p['Customer'] == cust].sort_values(by=['week', 'order_id'])
-            
-            # 2. Calculate Customer's Total "Bank Account" of Chips
-            # They get their fair share (Pro-Rata) of the Tier's allocation
-            total_cust_demand = cust_orders['quantity'].sum()
-            total_cust_alloc_pool = int(total_cust_demand * tier_global_rate)
-            
-            # 3. Pour the pool into the sorted orders
-            chips_in_bucket = total_cust_alloc_pool
-            
-            for _, row in cust_orders.iterrows():
-                qty_ordered = row['quantity']
-                
-                # Take from bucket
-                if chips_in_bucket >= qty_ordered:
-                    qty_given = qty_ordered
-                    chips_in_bucket -= qty_ordered
-                    status = "Full"
-                else:
-                    qty_given = chips_in_bucket
-                    chips_in_bucket = 0 # Bucket empty
-                    
-                    if qty_given == 0: status = "Unfulfilled"
-                    else: status = "Partial"
-                
-                final_rows.append({
-                    "week": row['week'],
-                    "order_id": row['order_id'],
-                    "customer_name": row['Customer'],
-                    "market_segment": row['Segment'],
-                    "priority": row['Priority'],
-                    "quantity": qty_ordered,
-                    "allocated_qty": qty_given,
-                    "status": status
-                })
+        # 3. Pour every customer's pool into their sorted orders in one native pass
+        qty = df_p['quantity'].to_numpy(dtype=np.int64)
+        cust_codes = df_p['Customer'].cat.codes.to_numpy()
+        qty_given, status = pour_fifo(cust_codes, qty, cust_pools)
+
+        tier_frames.append(pd.DataFrame({
+            "week": df_p['week'].array,
+            "order_id": df_p['order_id'].array,
+            "customer_name": df_p['Customer'].array,
+            "market_segment": df_p['Segment'].array,
+            "priority": df_p['Priority'].array,
+            "quantity": qty,
+            "allocated_qty": qty_given,
+            "status": pd.Categorical.from_codes(status, categories=STATUS_LABELS)
+        }))
         
         # Deduct this Tier's consumption from the Global Supply for the next Tier
-        remaining_supply_curve = remaining_supply_curve - tier_allocated_cum
+        np.subtract(remaining_supply_curve, tier_allocated_cum, out=remaining_supply_curve)
 
     # 5. SAVE REPORT
-    df_final = pd.DataFrame(final_rows)
-    
-    # Enforce Column Order
-    output_cols = ["week", "order_id", "customer_name", "market_segment", "priority", "quantity", "allocated_qty", "status"]
-    df_final = df_final[output_cols]
+    # Single concatenation at the end; frame construction order enforces the column order
+    df_final = pd.concat(tier_frames, ignore_index=True)
     
-    # Sort Final Report for readability
-    df_final = df_final.sort_values(by=['week', 'priority', 'customer_name'])
+    # Sort Final Report for readability (week, priority, customer) on integer codes
+    week_codes = df_final['week'].astype('category').cat.codes.to_numpy()
+    prio_codes = df_final['priority'].cat.codes.to_numpy()
+    cust = df_final['customer_name']
+    cust_codes = cust.cat.reorder_categories(sorted(cust.cat.categories)).cat.codes.to_numpy()
+    df_final = df_final.take(np.lexsort((cust_codes, prio_codes, week_codes)))
     
     output_csv = 'customer_allocation_report.csv'
-    df_final.to_csv(output_csv, index=False)
+    # Arrow's multithreaded C++ writer (string fields come out quoted, which is standard CSV)
+    pacsv.write_csv(pa.Table.from_pandas(df_final, preserve_index=False), output_csv)
     print(f"[SUCCESS] Flat Report saved: {output_csv}")
     print(f"   -> Logic: Week 1 Partials are filled before Week 3 New Orders.")
 
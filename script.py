@@ -16,9 +16,9 @@ import xlsxwriter
 #    - Constraint: Identifies if A or B caused the limit.
 # ==============================================================================
 
-def get_iso_week_str(date_obj: datetime) -> str:
-    iso_cal = date_obj.isocalendar()
-    return f"{iso_cal.year}-W{iso_cal.week:02d}"
+def get_iso_week_str(dates: pd.Series) -> pd.Series:
+    iso_cal = dates.dt.isocalendar()
+    return iso_cal['year'].astype(str) + "-W" + iso_cal['week'].astype(str).str.zfill(2)
 
 def generate_sample_data(seed: int = 42) -> Tuple[List[Dict], List[Dict]]:
     np.random.seed(seed)
@@ -46,7 +46,7 @@ def build_supply_df(raw_data: List[Dict]) -> pd.DataFrame:
     df = pd.DataFrame(raw_data)
     df['delivery_date'] = pd.to_datetime(df['delivery_date'])
     df['quantity'] = df['quantity'].astype(int)
-    df['week'] = df['delivery_date'].apply(get_iso_week_str)
+    df['week'] = get_iso_week_str(df['delivery_date'])
     return df.sort_values(by=['week', 'product_type']).reset_index(drop=True)
 
 def build_demand_df(raw_data: List[Dict]) -> pd.DataFrame:
@@ -54,7 +54,7 @@ def build_demand_df(raw_data: List[Dict]) -> pd.DataFrame:
     df = pd.DataFrame(raw_data)
     df['delivery_date'] = pd.to_datetime(df['delivery_date'])
     df['quantity'] = df['quantity'].astype(int)
-    df['week'] = df['delivery_date'].apply(get_iso_week_str)
+    df['week'] = get_iso_week_str(df['delivery_date'])
     return df.sort_values(by=['week', 'product_type']).reset_index(drop=True)
 
 def export_to_excel_with_formulas(supply_df: pd.DataFrame, demand_df: pd.DataFrame, output_path: str):
@@ -69,9 +69,12 @@ def export_to_excel_with_formulas(supply_df: pd.DataFrame, demand_df: pd.DataFra
     master_df = supply_agg.join(demand_agg, how='outer').fillna(0).astype(int)
     master_df = master_df.sort_index()
     
-    # Transpose so weeks are columns
-    df_act = master_df[['A', 'B', 'C']].T
-    weeks = df_act.columns.tolist()
+    # Weeks become worksheet columns; actuals are read positionally (row = week, col = A/B/C)
+    weeks = master_df.index.tolist()
+    act_arr = master_df[['A', 'B', 'C']].to_numpy()
+    
+    # Column letters for every week (data starts in column B)
+    col_letters = [xlsxwriter.utility.xl_col_to_name(i + 1) for i in range(len(weeks))]
     
     workbook = xlsxwriter.Workbook(output_path)
     
@@ -113,65 +116,59 @@ def export_to_excel_with_formulas(supply_df: pd.DataFrame, demand_df: pd.DataFra
     
     # Write Headers
     ws_main.write(0, 0, "Metric", header_fmt)
-    for i, week in enumerate(weeks):
-        ws_main.write(0, i + 1, week, header_fmt)
+    ws_main.write_row(0, 1, weeks, header_fmt)
     for r_idx, label in row_labels_main.items():
         ws_main.write(r_idx, 0, label, bold_fmt)
-        
-    for col_idx, week in enumerate(weeks):
-        xl_col = col_idx + 1
-        col_letter = xlsxwriter.utility.xl_col_to_name(xl_col)
-        
-        # 1. Actuals
-        ws_main.write_number(ROW_A_ACT, xl_col, master_df.loc[week, 'A'], num_fmt)
-        ws_main.write_number(ROW_B_ACT, xl_col, master_df.loc[week, 'B'], num_fmt)
-        ws_main.write_number(ROW_C_ACT, xl_col, master_df.loc[week, 'C'], num_fmt)
-        
-        # 2. Demand Prior
-        curr_act_ref = f"{col_letter}{ROW_C_ACT + 1}"
-        if col_idx < len(weeks) - 1:
-            next_col_letter = xlsxwriter.utility.xl_col_to_name(xl_col + 1)
-            next_act_ref = f"{next_col_letter}{ROW_C_ACT + 1}"
-            if col_idx == 0: formula_prior = f"={curr_act_ref} + {next_act_ref}"
-            else: formula_prior = f"={next_act_ref}"
-        else:
-            if col_idx == 0: formula_prior = f"={curr_act_ref}"
-            else: formula_prior = "0"
-        ws_main.write_formula(ROW_C_PRIOR, xl_col, formula_prior, highlight_fmt)
-
-        # 3. Calculation Ranges (Used for Commit & Constraint)
-        sum_a = f"SUM(${'B'}{ROW_A_ACT+1}:{col_letter}{ROW_A_ACT+1})"
-        sum_b = f"SUM(${'B'}{ROW_B_ACT+1}:{col_letter}{ROW_B_ACT+1})"
-        sum_prior = f"SUM(${'B'}{ROW_C_PRIOR+1}:{col_letter}{ROW_C_PRIOR+1})"
-        
-        # 4. Total Commit (Cumulative Min)
-        formula_commit_cum = f"MIN({sum_a}, {sum_b}, {sum_prior})"
-        ws_main.write_formula(ROW_COMMIT_TOT, xl_col, f"={formula_commit_cum}", num_fmt)
-        
-        # 5. Weekly Commit (Delta)
-        curr_tot_ref = f"{col_letter}{ROW_COMMIT_TOT + 1}"
-        if col_idx == 0:
-            formula_weekly = f"={curr_tot_ref}"
-        else:
-            prev_col_letter = xlsxwriter.utility.xl_col_to_name(xl_col - 1)
-            prev_tot_ref = f"{prev_col_letter}{ROW_COMMIT_TOT + 1}"
-            formula_weekly = f"={curr_tot_ref} - {prev_tot_ref}"
-        ws_main.write_formula(ROW_COMMIT, xl_col, formula_weekly, num_fmt)
-
-        # 6. Total Demand (Actual Cumulative)
-        sum_dem_act = f"SUM(${'B'}{ROW_C_ACT+1}:{col_letter}{ROW_C_ACT+1})"
-        ws_main.write_formula(ROW_DEMAND_TOT, xl_col, f"={sum_dem_act}", num_fmt)
-
-        # 7. Backlog (Commit Tot - Demand Tot)
-        dem_tot_ref = f"{col_letter}{ROW_DEMAND_TOT + 1}"
-        ws_main.write_formula(ROW_BACKLOG, xl_col, f"={curr_tot_ref} - {dem_tot_ref}", num_fmt)
-        
-        # 8. Constraint Logic
-        #    IF Commit_Tot == Sum_Prior -> "-" (Unconstrained/Met Target)
-        #    ELSE IF Sum_A <= Sum_B -> "Supply A"
-        #    ELSE -> "Supply B"
-        formula_constraint = f'=IF({curr_tot_ref}={sum_prior}, "-", IF({sum_a}<={sum_b}, "Supply A", "Supply B"))'
-        ws_main.write_formula(ROW_CONSTRAINT, xl_col, formula_constraint)
+    
+    # Every row is built as a full list of weekly cells and written in one call
+    n_weeks = len(weeks)
+    
+    # 1. Actuals
+    ws_main.write_row(ROW_A_ACT, 1, act_arr[:, 0].tolist(), num_fmt)
+    ws_main.write_row(ROW_B_ACT, 1, act_arr[:, 1].tolist(), num_fmt)
+    ws_main.write_row(ROW_C_ACT, 1, act_arr[:, 2].tolist(), num_fmt)
+    
+    # 2. Demand Prior (W1 = Act W1 + Act W2, Wn = Act W(n+1), last week = 0)
+    act_c_refs = [f"{cl}{ROW_C_ACT + 1}" for cl in col_letters]
+    prior_formulas = [f"={act_c_refs[i + 1]}" if i < n_weeks - 1 else "=0" for i in range(n_weeks)]
+    if n_weeks > 1: prior_formulas[0] = f"={act_c_refs[0]} + {act_c_refs[1]}"
+    elif n_weeks == 1: prior_formulas[0] = f"={act_c_refs[0]}"
+    ws_main.write_row(ROW_C_PRIOR, 1, prior_formulas, highlight_fmt)
+    
+    # 3. Calculation Ranges (Used for Commit & Constraint), built once per week
+    sum_a_list = [f"SUM($B{ROW_A_ACT+1}:{cl}{ROW_A_ACT+1})" for cl in col_letters]
+    sum_b_list = [f"SUM($B{ROW_B_ACT+1}:{cl}{ROW_B_ACT+1})" for cl in col_letters]
+    sum_prior_list = [f"SUM($B{ROW_C_PRIOR+1}:{cl}{ROW_C_PRIOR+1})" for cl in col_letters]
+    sum_dem_act_list = [f"SUM($B{ROW_C_ACT+1}:{cl}{ROW_C_ACT+1})" for cl in col_letters]
+    tot_refs = [f"{cl}{ROW_COMMIT_TOT + 1}" for cl in col_letters]
+    dem_tot_refs = [f"{cl}{ROW_DEMAND_TOT + 1}" for cl in col_letters]
+    
+    # 4. Total Commit (Cumulative Min)
+    commit_cum_formulas = [f"=MIN({a}, {b}, {prior})" for a, b, prior in zip(sum_a_list, sum_b_list, sum_prior_list)]
+    ws_main.write_row(ROW_COMMIT_TOT, 1, commit_cum_formulas, num_fmt)
+    
+    # 5. Weekly Commit (Delta)
+    weekly_formulas = [f"={ref}" for ref in tot_refs[:1]] + [
+        f"={curr} - {prev}" for prev, curr in zip(tot_refs, tot_refs[1:])
+    ]
+    ws_main.write_row(ROW_COMMIT, 1, weekly_formulas, num_fmt)
+    
+    # 6. Total Demand (Actual Cumulative)
+    ws_main.write_row(ROW_DEMAND_TOT, 1, ["=" + f for f in sum_dem_act_list], num_fmt)
+    
+    # 7. Backlog (Commit Tot - Demand Tot)
+    backlog_formulas = [f"={tot} - {dem}" for tot, dem in zip(tot_refs, dem_tot_refs)]
+    ws_main.write_row(ROW_BACKLOG, 1, backlog_formulas, num_fmt)
+    
+    # 8. Constraint Logic
+    #    IF Commit_Tot == Sum_Prior -> "-" (Unconstrained/Met Target)
+    #    ELSE IF Sum_A <= Sum_B -> "Supply A"
+    #    ELSE -> "Supply B"
+    constraint_formulas = [
+        f'=IF({tot}={prior}, "-", IF({a}<={b}, "Supply A", "Supply B"))'
+        for tot, prior, a, b in zip(tot_refs, sum_prior_list, sum_a_list, sum_b_list)
+    ]
+    ws_main.write_row(ROW_CONSTRAINT, 1, constraint_formulas)
 
     # Conditional Formatting for Backlog (Red if negative)
     last_col = xlsxwriter.utility.xl_col_to_name(len(weeks))
@@ -198,27 +195,21 @@ def export_to_excel_with_formulas(supply_df: pd.DataFrame, demand_df: pd.DataFra
     green_text = workbook.add_format({'font_color': '#006100', 'bg_color': '#C6EFCE', 'num_format': '#,##0'})
     
     ws_comp.write(0, 0, "Component A Analysis", header_fmt)
-    for i, week in enumerate(weeks):
-        ws_comp.write(0, i + 1, week, header_fmt)
+    ws_comp.write_row(0, 1, weeks, header_fmt)
     for r_idx, label in comp_labels.items():
         ws_comp.write(r_idx, 0, label, bold_fmt)
-        
-    for col_idx, week in enumerate(weeks):
-        xl_col = col_idx + 1
-        col_letter = xlsxwriter.utility.xl_col_to_name(xl_col)
-        
-        # Target (from Summary Sheet)
-        sum_target_ref = f"SUM('Summary'!$B${ROW_C_PRIOR+1}:{col_letter}${ROW_C_PRIOR+1})"
-        ws_comp.write_formula(ROW_TARGET_CUM, xl_col, f"={sum_target_ref}", num_fmt)
-        
-        # Supply A (from Summary Sheet)
-        sum_a_ref = f"SUM('Summary'!$B${ROW_A_ACT+1}:{col_letter}${ROW_A_ACT+1})"
-        ws_comp.write_formula(ROW_A_CUM, xl_col, f"={sum_a_ref}", num_fmt)
-        
-        # Standing
-        curr_target = f"{col_letter}{ROW_TARGET_CUM+1}"
-        curr_a = f"{col_letter}{ROW_A_CUM+1}"
-        ws_comp.write_formula(ROW_A_STANDING, xl_col, f"={curr_a} - {curr_target}", num_fmt)
+    
+    # Target (from Summary Sheet)
+    target_formulas = [f"=SUM('Summary'!$B${ROW_C_PRIOR+1}:{cl}${ROW_C_PRIOR+1})" for cl in col_letters]
+    ws_comp.write_row(ROW_TARGET_CUM, 1, target_formulas, num_fmt)
+    
+    # Supply A (from Summary Sheet)
+    supply_a_formulas = [f"=SUM('Summary'!$B${ROW_A_ACT+1}:{cl}${ROW_A_ACT+1})" for cl in col_letters]
+    ws_comp.write_row(ROW_A_CUM, 1, supply_a_formulas, num_fmt)
+    
+    # Standing
+    standing_formulas = [f"={cl}{ROW_A_CUM+1} - {cl}{ROW_TARGET_CUM+1}" for cl in col_letters]
+    ws_comp.write_row(ROW_A_STANDING, 1, standing_formulas, num_fmt)
 
     standing_range = f"B{ROW_A_STANDING+1}:{last_col}{ROW_A_STANDING+1}"
     ws_comp.conditional_format(standing_range, {'type': 'cell', 'criteria': '<', 'value': 0, 'format': red_text})